@@ -0,0 +1,41 @@
+"""Small numeric helpers shared by the analysis modules."""
+from __future__ import annotations
+
+import math
+
+from scipy import stats
+
+from ._constants import SQRT2
+
+
+def two_sided_p(z: float) -> float:
+    """Two-sided normal p-value, 2·(1 − Φ(|z|)), via erfc to keep tail precision."""
+    return math.erfc(abs(z) / SQRT2)
+
+
+def chi2_2x2(
+    a: float,
+    b: float,
+    c: float,
+    d: float,
+    correction: bool = True,
+) -> tuple[float, float, list[list[float]]]:
+    """
+    Pearson chi-square for the 2x2 table [[a, b], [c, d]] in closed form.
+
+    Returns (chi2, p_value, expected). Matches ``scipy.stats.chi2_contingency``
+    on 2x2 input, including its Yates correction (each |O − E| shrunk by at
+    most 0.5) and its ValueError when an expected count is zero.
+    """
+    r1, r2 = a + b, c + d
+    c1, c2 = a + c, b + d
+    n = r1 + r2
+    if r1 == 0 or r2 == 0 or c1 == 0 or c2 == 0:
+        raise ValueError("The internally computed table of expected frequencies has a zero element.")
+
+    dev = abs(a * d - b * c)
+    if correction:
+        dev = max(dev - n / 2, 0.0)
+    chi2 = n * dev * dev / (r1 * r2 * c1 * c2)
+    expected = [[r1 * c1 / n, r1 * c2 / n], [r2 * c1 / n, r2 * c2 / n]]
+    return chi2, float(stats.chi2.sf(chi2, 1)), expected
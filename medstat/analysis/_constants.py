@@ -0,0 +1,9 @@
+"""Numeric constants shared by the analysis modules."""
+from __future__ import annotations
+
+import math
+
+# Two-sided 95% standard-normal quantile, scipy.stats.norm.ppf(0.975)
+Z_95 = 1.959963984540054
+
+SQRT2 = math.sqrt(2)
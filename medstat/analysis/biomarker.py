@@ -1,10 +1,16 @@
 """Biomarker analysis: ROC curves, AUC, sensitivity/specificity."""
 from __future__ import annotations
 
+import math
+
 import numpy as np
-from scipy import stats
 from typing import Optional
 
+from ._common import two_sided_p
+from ._constants import Z_95
+
+_DEFAULT_PCTS = np.linspace(10, 90, 10)
+
 
 def run_roc_analysis(
     marker: list[float],
@@ -19,47 +25,52 @@ def run_roc_analysis(
     positive_direction: "high" if higher marker → positive outcome,
                         "low"  if lower marker → positive outcome.
     """
-    from sklearn.metrics import roc_curve, auc as sklearn_auc
+    m = np.asarray(marker, dtype=float)
+    y = np.asarray(outcome, dtype=int)
+    if not np.isfinite(m).all():
+        raise ValueError("marker contains NaN or infinite values.")
 
-    m = np.array(marker, dtype=float)
-    y = np.array(outcome, dtype=int)
+    # One stable sort of the marker feeds both the ROC curve and the decile
+    # table; the helpers walk it from whichever end the direction calls for
+    order = np.argsort(m, kind="mergesort")
+    m_sorted = m[order]
+    y_sorted = y[order]
 
-    m_eval = -m if positive_direction == "low" else m
+    cum_pos = np.concatenate(([0], np.cumsum(y_sorted)))
+    cum_neg = np.concatenate(([0], np.cumsum(1 - y_sorted)))
 
-    fpr, tpr, thresholds_sk = roc_curve(y, m_eval)
-    roc_auc = float(sklearn_auc(fpr, tpr))
+    fpr, tpr, thresholds_roc, roc_auc, n_pos, n_neg = _roc_core(m_sorted, y_sorted, positive_direction)
 
-    auc_se = _hanley_mcneil_se(y, m_eval, roc_auc)
+    auc_se = _hanley_mcneil_se(n_pos, n_neg, roc_auc)
     z_val = float((roc_auc - 0.5) / auc_se) if auc_se > 0 else 0.0
-    auc_p = float(2 * (1 - stats.norm.cdf(abs(z_val))))
-    auc_ci = (float(max(0.0, roc_auc - 1.96*auc_se)), float(min(1.0, roc_auc + 1.96*auc_se)))
+    auc_p = two_sided_p(z_val)
+    auc_ci = (float(max(0.0, roc_auc - Z_95*auc_se)), float(min(1.0, roc_auc + Z_95*auc_se)))
 
     # Youden's index for optimal threshold
     j_scores = tpr - fpr
     opt_idx = int(np.argmax(j_scores))
-    opt_thresh_eval = float(thresholds_sk[opt_idx])
-    opt_thresh = -opt_thresh_eval if positive_direction == "low" else opt_thresh_eval
+    opt_thresh = float(thresholds_roc[opt_idx])
 
-    opt_perf = _threshold_performance(y, m, opt_thresh, positive_direction)
+    opt_perf = _threshold_performance_sorted(m_sorted, cum_pos, cum_neg, opt_thresh, positive_direction)
 
     # User-supplied threshold performance
     sel_perf = None
     if threshold is not None:
-        sel_perf = _threshold_performance(y, m, threshold, positive_direction)
+        sel_perf = _threshold_performance_sorted(m_sorted, cum_pos, cum_neg, threshold, positive_direction)
 
     # Downsample ROC curve for response (max 300 points)
     n_pts = min(300, len(fpr))
     idx = np.round(np.linspace(0, len(fpr) - 1, n_pts)).astype(int)
 
     # Sensitivity/specificity table at decile thresholds
-    sens_spec_table = _build_sens_spec_table(y, m, m_eval, positive_direction)
+    sens_spec_table = _build_sens_spec_table(m_sorted, cum_pos, cum_neg, positive_direction)
 
     return {
         "type": "roc",
         "marker_name": marker_name,
         "n": int(len(y)),
-        "n_positive": int(np.sum(y == 1)),
-        "n_negative": int(np.sum(y == 0)),
+        "n_positive": n_pos,
+        "n_negative": n_neg,
         "prevalence": float(np.mean(y)),
         "auc": roc_auc,
         "auc_se": float(auc_se),
@@ -81,37 +92,89 @@ def run_roc_analysis(
     }
 
 
-def _hanley_mcneil_se(y: np.ndarray, scores: np.ndarray, auc: float) -> float:
+def _roc_core(
+    marker_sorted: np.ndarray,
+    y_sorted: np.ndarray,
+    direction: str,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, float, int, int]:
+    """
+    ROC curve, trapezoidal AUC and class counts from a marker sorted ascending.
+
+    Emits one point per distinct marker value and drops collinear intermediate
+    points, matching ``sklearn.metrics.roc_curve(drop_intermediate=True)``.
+    Thresholds are returned in marker units.
+    """
+    # Walk from the most to the least positive-looking marker value
+    if direction == "low":
+        s_sorted = marker_sorted
+    else:
+        s_sorted = marker_sorted[::-1]
+        y_sorted = y_sorted[::-1]
+
+    cut = np.r_[np.flatnonzero(np.diff(s_sorted)), y_sorted.size - 1]
+    tps = np.cumsum(y_sorted)[cut]
+    fps = 1 + cut - tps
+    thresholds = s_sorted[cut]
+
+    if tps.size > 2:
+        keep = np.flatnonzero(np.r_[True, np.logical_or(np.diff(fps, 2), np.diff(tps, 2)), True])
+        tps, fps, thresholds = tps[keep], fps[keep], thresholds[keep]
+
+    tps = np.r_[0, tps]
+    fps = np.r_[0, fps]
+    thresholds = np.r_[-np.inf if direction == "low" else np.inf, thresholds]
+
+    n1, n0 = int(tps[-1]), int(fps[-1])
+    tpr = tps / n1 if n1 > 0 else np.full(tps.shape, np.nan)
+    fpr = fps / n0 if n0 > 0 else np.full(fps.shape, np.nan)
+    auc = float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1])) / 2)
+    return fpr, tpr, thresholds, auc, n1, n0
+
+
+def _hanley_mcneil_se(n1: int, n0: int, auc: float) -> float:
     """Hanley-McNeil (1982) SE approximation for AUC."""
-    n1 = int(np.sum(y == 1))
-    n0 = int(np.sum(y == 0))
     if n1 == 0 or n0 == 0:
         return 0.0
     q1 = auc / (2 - auc)
     q2 = 2 * auc ** 2 / (1 + auc)
     var = (auc*(1-auc) + (n1-1)*(q1-auc**2) + (n0-1)*(q2-auc**2)) / (n1 * n0)
-    return float(np.sqrt(max(var, 0.0)))
+    return math.sqrt(max(var, 0.0))
 
 
-def _threshold_performance(
-    y: np.ndarray,
-    marker: np.ndarray,
+def _threshold_performance_sorted(
+    marker_sorted: np.ndarray,
+    cum_pos: np.ndarray,
+    cum_neg: np.ndarray,
     threshold: float,
     direction: str,
 ) -> dict:
-    pred = (marker >= threshold).astype(int) if direction == "high" \
-        else (marker <= threshold).astype(int)
+    """
+    Performance at one threshold in O(log n).
+
+    cum_pos/cum_neg are the cumulative positive/negative label counts over
+    the ascending marker, each with a leading 0.
+    """
+    if direction == "low":
+        # m <= threshold is called positive
+        idx = int(np.searchsorted(marker_sorted, threshold, side="right"))
+        tp, fp = int(cum_pos[idx]), int(cum_neg[idx])
+        fn, tn = int(cum_pos[-1]) - tp, int(cum_neg[-1]) - fp
+    else:
+        # m >= threshold is called positive
+        idx = int(np.searchsorted(marker_sorted, threshold, side="left"))
+        fn, tn = int(cum_pos[idx]), int(cum_neg[idx])
+        tp, fp = int(cum_pos[-1]) - fn, int(cum_neg[-1]) - tn
+
+    return _performance_from_counts(threshold, tp, fp, tn, fn)
 
-    tp = int(np.sum((pred == 1) & (y == 1)))
-    fp = int(np.sum((pred == 1) & (y == 0)))
-    tn = int(np.sum((pred == 0) & (y == 0)))
-    fn = int(np.sum((pred == 0) & (y == 1)))
 
+def _performance_from_counts(threshold: float, tp: int, fp: int, tn: int, fn: int) -> dict:
+    n = tp + fp + tn + fn
     sens = tp / (tp + fn) if (tp + fn) > 0 else 0.0
     spec = tn / (tn + fp) if (tn + fp) > 0 else 0.0
     ppv = tp / (tp + fp) if (tp + fp) > 0 else 0.0
     npv = tn / (tn + fn) if (tn + fn) > 0 else 0.0
-    acc = (tp + tn) / len(y) if len(y) > 0 else 0.0
+    acc = (tp + tn) / n if n > 0 else 0.0
     plr = sens / (1 - spec) if spec < 1 else None
     nlr = (1 - sens) / spec if spec > 0 else None
 
@@ -129,19 +192,24 @@ def _threshold_performance(
 
 
 def _build_sens_spec_table(
-    y: np.ndarray,
-    marker: np.ndarray,
-    marker_eval: np.ndarray,
+    marker_sorted: np.ndarray,
+    cum_pos: np.ndarray,
+    cum_neg: np.ndarray,
     direction: str,
-    n_points: int = 10,
+    percentiles: np.ndarray = _DEFAULT_PCTS,
 ) -> list[dict]:
-    percentiles = np.linspace(10, 90, n_points)
-    thresholds_eval = np.percentile(marker_eval, percentiles)
-    rows = []
-    for t_eval in thresholds_eval:
-        t_orig = -t_eval if direction == "low" else t_eval
-        rows.append(_threshold_performance(y, marker, t_orig, direction))
-    return rows
+    # Linear-interpolated percentiles of the positive-evidence ordering, read
+    # straight off the sorted marker (reversed view for "low")
+    ranked = marker_sorted[::-1] if direction == "low" else marker_sorted
+    pos = percentiles / 100 * (ranked.size - 1)
+    lo = np.floor(pos).astype(int)
+    hi = np.ceil(pos).astype(int)
+    thresholds = ranked[lo] + (pos - lo) * (ranked[hi] - ranked[lo])
+
+    return [
+        _threshold_performance_sorted(marker_sorted, cum_pos, cum_neg, float(t), direction)
+        for t in thresholds
+    ]
 
 
 def _interpret_auc(auc: float) -> str:
@@ -1,11 +1,15 @@
 """Clinical trials statistics: t-tests, ANOVA, chi-square, power/sample size."""
 from __future__ import annotations
 
-import itertools
+import functools
+
 import numpy as np
 from scipy import stats
 from typing import Literal, Optional
 
+from ._common import chi2_2x2
+from ._constants import SQRT2, Z_95
+
 
 def run_ttest(
     group1: list[float],
@@ -13,42 +17,48 @@ def run_ttest(
     paired: bool = False,
     equal_var: bool = False,
 ) -> dict:
-    a = np.array(group1, dtype=float)
-    b = np.array(group2, dtype=float)
+    a = np.asarray(group1, dtype=float)
+    b = np.asarray(group2, dtype=float)
+    n1, n2 = len(a), len(b)
+    m1, m2 = float(np.mean(a)), float(np.mean(b))
+    # Left as NumPy scalars so a zero-variance group yields nan/inf, as scipy does
+    s1, s2 = np.var(a, ddof=1), np.var(b, ddof=1)
 
     if paired:
-        if len(a) != len(b):
+        if n1 != n2:
             raise ValueError("Paired t-test requires equal group sizes.")
         diffs = a - b
         t_stat, p_value = stats.ttest_rel(a, b)
-        df = len(a) - 1
+        df = n1 - 1
         diff = float(np.mean(diffs))
-        ci = stats.t.interval(0.95, df, diff, stats.sem(diffs))
+        ci = _t_ci95(df, diff, stats.sem(diffs))
         cohens_d = diff / float(np.std(diffs, ddof=1))
     else:
-        t_stat, p_value = stats.ttest_ind(a, b, equal_var=equal_var)
-        df_val = getattr(t_stat, "df", len(a) + len(b) - 2)
-        # Welch's df
-        s1, s2 = np.var(a, ddof=1), np.var(b, ddof=1)
-        n1, n2 = len(a), len(b)
-        df = float((s1/n1 + s2/n2)**2 / ((s1/n1)**2/(n1-1) + (s2/n2)**2/(n2-1))) \
-            if not equal_var else float(n1 + n2 - 2)
-        diff = float(np.mean(a) - np.mean(b))
-        se_diff = float(np.sqrt(s1/n1 + s2/n2)) if not equal_var else \
-            float(np.sqrt(((n1-1)*s1 + (n2-1)*s2)/(n1+n2-2) * (1/n1 + 1/n2)))
-        ci = stats.t.interval(0.95, df, diff, se_diff)
+        # Two-sample t computed inline; scipy is only used for the t tail
+        diff = m1 - m2
+        if equal_var:
+            df = float(n1 + n2 - 2)
+            se_diff = np.sqrt(((n1-1)*s1 + (n2-1)*s2)/(n1+n2-2) * (1/n1 + 1/n2))
+        else:
+            # Welch-Satterthwaite df
+            v1, v2 = s1/n1, s2/n2
+            df = float((v1 + v2)**2 / (v1**2/(n1-1) + v2**2/(n2-1)))
+            se_diff = np.sqrt(v1 + v2)
+        t_stat = diff / se_diff
+        p_value = 2 * stats.t.sf(abs(t_stat), df)
+        ci = _t_ci95(df, diff, se_diff)
         pooled_sd = float(np.sqrt(((n1-1)*s1 + (n2-1)*s2) / (n1+n2-2)))
-        cohens_d = (float(np.mean(a)) - float(np.mean(b))) / pooled_sd if pooled_sd > 0 else 0.0
+        cohens_d = (m1 - m2) / pooled_sd if pooled_sd > 0 else 0.0
 
     return {
         "type": "ttest",
         "paired": paired,
-        "n1": int(len(a)),
-        "n2": int(len(b)),
-        "mean1": float(np.mean(a)),
-        "mean2": float(np.mean(b)),
-        "sd1": float(np.std(a, ddof=1)),
-        "sd2": float(np.std(b, ddof=1)),
+        "n1": int(n1),
+        "n2": int(n2),
+        "mean1": m1,
+        "mean2": m2,
+        "sd1": float(np.sqrt(s1)),
+        "sd2": float(np.sqrt(s2)),
         "mean_diff": float(diff),
         "ci_95": [float(ci[0]), float(ci[1])],
         "t_stat": float(t_stat),
@@ -64,40 +74,53 @@ def run_anova(
     groups: list[list[float]],
     group_names: Optional[list[str]] = None,
 ) -> dict:
-    arrays = [np.array(g, dtype=float) for g in groups]
+    arrays = [np.asarray(g, dtype=float) for g in groups]
     k = len(arrays)
-    n_total = sum(len(a) for a in arrays)
+    ns = np.fromiter((a.size for a in arrays), dtype=np.int64, count=k)
+    n_total = int(ns.sum())
 
     if group_names is None:
         group_names = [f"Group {i+1}" for i in range(k)]
 
+    # One mean and one sum of squares per group, reused below
+    means = np.fromiter((a.mean() for a in arrays), dtype=np.float64, count=k)
+    ss_groups = np.fromiter((np.sum((a - m)**2) for a, m in zip(arrays, means)), dtype=np.float64, count=k)
+
     f_stat, p_value = stats.f_oneway(*arrays)
-    grand_mean = float(np.mean(np.concatenate(arrays)))
+    grand_mean = float((ns * means).sum() / n_total)
 
-    ss_between = float(sum(len(a) * (float(np.mean(a)) - grand_mean)**2 for a in arrays))
-    ss_within = float(sum(float(np.sum((a - float(np.mean(a)))**2)) for a in arrays))
+    ss_between = float((ns * (means - grand_mean)**2).sum())
+    ss_within = float(ss_groups.sum())
     df_between = k - 1
     df_within = n_total - k
     ms_between = ss_between / df_between
     ms_within = ss_within / df_within if df_within > 0 else 0.0
     eta2 = float(ss_between / (ss_between + ss_within)) if (ss_between + ss_within) > 0 else 0.0
 
-    group_stats = []
-    for name, arr in zip(group_names, arrays):
-        se = float(stats.sem(arr))
-        ci = stats.t.interval(0.95, len(arr) - 1, float(np.mean(arr)), se) if len(arr) > 1 else (float(np.mean(arr)), float(np.mean(arr)))
-        group_stats.append({
+    # Per-group SD/SE and 95% t intervals, with one t.ppf call for all groups
+    has_df = ns > 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sds = np.sqrt(ss_groups / (ns - 1))
+    ses = sds / np.sqrt(ns)
+    half = np.where(has_df, stats.t.ppf(0.975, np.where(has_df, ns - 1, 1)) * ses, 0.0)
+    group_stats = [
+        {
             "name": name,
-            "n": int(len(arr)),
-            "mean": float(np.mean(arr)),
-            "sd": float(np.std(arr, ddof=1)),
+            "n": n,
+            "mean": m,
+            "sd": sd,
             "se": se,
-            "ci_95": [float(ci[0]), float(ci[1])],
-        })
+            "ci_95": [lo, hi],
+        }
+        for name, n, m, sd, se, lo, hi in zip(
+            group_names, ns.tolist(), means.tolist(), sds.tolist(), ses.tolist(),
+            (means - half).tolist(), (means + half).tolist(),
+        )
+    ]
 
     posthoc = []
     if float(p_value) < 0.05 and k > 2:
-        posthoc = _tukey_hsd(arrays, group_names, ms_within, df_within)
+        posthoc = _tukey_hsd(arrays, group_names, means, ns, ms_within, df_within)
 
     return {
         "type": "anova",
@@ -120,28 +143,32 @@ def run_anova(
     }
 
 
-def _tukey_hsd(arrays, names, ms_within, df_within) -> list:
-    results = []
-    for (i, a), (j, b) in itertools.combinations(enumerate(arrays), 2):
-        diff = float(np.mean(a) - np.mean(b))
-        q_se = float(np.sqrt(ms_within / 2 * (1/len(a) + 1/len(b))))
-        q_stat = abs(diff) / q_se if q_se > 0 else 0.0
-        try:
-            from scipy.stats import studentized_range
-            p = float(1 - studentized_range.cdf(q_stat * np.sqrt(2), len(arrays), df_within))
-        except Exception:
-            k = len(arrays)
-            _, p_raw = stats.ttest_ind(a, b)
-            p = float(min(1.0, float(p_raw) * k * (k - 1) / 2))
-
-        results.append({
+def _tukey_hsd(arrays, names, means, ns, ms_within, df_within) -> list:
+    k = len(arrays)
+    i_idx, j_idx = np.triu_indices(k, 1)
+    diffs = means[i_idx] - means[j_idx]
+    inv_n = 1.0 / ns
+    q_se = np.sqrt(ms_within / 2 * (inv_n[i_idx] + inv_n[j_idx]))
+    q_stat = np.divide(np.abs(diffs), q_se, out=np.zeros_like(diffs), where=q_se > 0)
+    try:
+        from scipy.stats import studentized_range
+        p_values = studentized_range.sf(q_stat * SQRT2, k, df_within).tolist()
+    except Exception:
+        p_values = [
+            float(min(1.0, float(stats.ttest_ind(arrays[i], arrays[j])[1]) * k * (k - 1) / 2))
+            for i, j in zip(i_idx, j_idx)
+        ]
+
+    return [
+        {
             "group1": names[i],
             "group2": names[j],
-            "mean_diff": diff,
+            "mean_diff": float(diff),
             "p_adjusted": float(p),
             "significant": p < 0.05,
-        })
-    return results
+        }
+        for i, j, diff, p in zip(i_idx.tolist(), j_idx.tolist(), diffs.tolist(), p_values)
+    ]
 
 
 def run_chi_square(
@@ -152,10 +179,16 @@ def run_chi_square(
 ) -> dict:
     from scipy.stats import chi2_contingency, fisher_exact
 
-    obs = np.array(observed, dtype=float)
+    obs = np.asarray(observed, dtype=float)
     is_2x2 = obs.shape == (2, 2)
 
-    chi2, p_chi2, dof, expected = chi2_contingency(obs, correction=yates_correction and is_2x2)
+    if is_2x2:
+        (a, b), (c, d) = obs.tolist()
+        chi2, p_chi2, expected = chi2_2x2(a, b, c, d, correction=yates_correction)
+        dof = 1
+        expected = np.array(expected)
+    else:
+        chi2, p_chi2, dof, expected = chi2_contingency(obs, correction=False)
 
     fisher_result = None
     if is_2x2:
@@ -173,7 +206,7 @@ def run_chi_square(
     return {
         "type": "chi_square",
         "observed": obs.tolist(),
-        "expected": [[round(v, 2) for v in row] for row in expected.tolist()],
+        "expected": np.round(expected, 2).tolist(),
         "row_names": row_names,
         "col_names": col_names,
         "chi2": float(chi2),
@@ -197,8 +230,8 @@ def run_sample_size(
     p2: Optional[float] = None,
     ratio: float = 1.0,
 ) -> dict:
-    z_alpha = float(stats.norm.ppf(1 - alpha / 2))
-    z_beta = float(stats.norm.ppf(power))
+    z_alpha = Z_95 if alpha == 0.05 else _norm_ppf(1 - alpha / 2)
+    z_beta = _norm_ppf(power)
 
     if test == "ttest_2samp":
         if effect_size is None:
@@ -244,3 +277,18 @@ def _interpret_cohens_d(d: float) -> str:
         return "medium"
     else:
         return "large"
+
+
+@functools.lru_cache(maxsize=128)
+def _norm_ppf(q: float) -> float:
+    return float(stats.norm.ppf(q))
+
+
+@functools.lru_cache(maxsize=256)
+def _t_ppf(q: float, df: float) -> float:
+    return float(stats.t.ppf(q, df))
+
+
+def _t_ci95(df: float, loc: float, scale: float) -> tuple[float, float]:
+    half = _t_ppf(0.975, df) * scale
+    return loc - half, loc + half
@@ -1,10 +1,15 @@
 """Epidemiology statistics: 2x2 tables, OR/RR, logistic regression."""
 from __future__ import annotations
 
+import math
+
 import numpy as np
 from scipy import stats
 from typing import Optional
 
+from ._common import chi2_2x2, two_sided_p
+from ._constants import Z_95
+
 
 def run_two_by_two(
     a: int,
@@ -24,44 +29,16 @@ def run_two_by_two(
     af, bf, cf, df_ = float(a), float(b), float(c), float(d)
     n = af + bf + cf + df_
 
-    # ── Risks ──────────────────────────────────────────────────────────────
-    p1 = af / (af + bf) if (af + bf) > 0 else 0.0   # risk in exposed
-    p0 = cf / (cf + df_) if (cf + df_) > 0 else 0.0  # risk in unexposed
-    rd = p1 - p0
-    rd_se = float(np.sqrt(p1*(1-p1)/(af+bf) + p0*(1-p0)/(cf+df_))) if (af+bf) > 0 and (cf+df_) > 0 else 0.0
-    rd_ci = (rd - 1.96*rd_se, rd + 1.96*rd_se)
-
-    # ── Odds Ratio (Woolf CI) ──────────────────────────────────────────────
-    if bf > 0 and cf > 0:
-        or_val = float(af * df_ / (bf * cf))
-        log_or_se = float(np.sqrt(1/af + 1/bf + 1/cf + 1/df_))
-        log_or = float(np.log(or_val))
-        or_ci = (float(np.exp(log_or - 1.96*log_or_se)), float(np.exp(log_or + 1.96*log_or_se)))
-    else:
-        or_val, or_ci = None, (None, None)
-
-    # ── Relative Risk (Katz log CI) ────────────────────────────────────────
-    if p0 > 0 and p1 > 0:
-        rr_val = float(p1 / p0)
-        log_rr = float(np.log(rr_val))
-        log_rr_se = float(np.sqrt(bf/(af*(af+bf)) + df_/(cf*(cf+df_))))
-        rr_ci = (float(np.exp(log_rr - 1.96*log_rr_se)), float(np.exp(log_rr + 1.96*log_rr_se)))
-    else:
-        rr_val, rr_ci = None, (None, None)
+    p1, p0, rd, rd_ci, or_val, or_ci, rr_val, rr_ci, nnt_val, are = _two_by_two_core(af, bf, cf, df_)
 
     # ── Chi-square + Fisher's exact ────────────────────────────────────────
-    from scipy.stats import chi2_contingency, fisher_exact
-    table = np.array([[af, bf], [cf, df_]])
-    chi2, p_chi2, dof, _ = chi2_contingency(table, correction=True)
-    _, p_fisher = fisher_exact(table.astype(int))
+    from scipy.stats import fisher_exact
+    chi2, p_chi2, _ = chi2_2x2(af, bf, cf, df_, correction=True)
+    dof = 1
+    _, p_fisher = fisher_exact([[int(a), int(b)], [int(c), int(d)]])
 
-    # ── NNT / NNH ─────────────────────────────────────────────────────────
-    nnt_val = float(1.0 / abs(rd)) if abs(rd) > 1e-10 else None
     nnt_type = "NNT (benefit)" if rd < 0 else ("NNH (harm)" if rd > 0 else "N/A")
 
-    # ── Attributable risk (exposed) ────────────────────────────────────────
-    are = float((p1 - p0) / p1) if p1 > 0 else None
-
     return {
         "type": "two_by_two",
         "table": {"a": int(a), "b": int(b), "c": int(c), "d": int(d), "n": int(n)},
@@ -93,6 +70,47 @@ def run_two_by_two(
     }
 
 
+def _two_by_two_core(af: float, bf: float, cf: float, df_: float) -> tuple:
+    """
+    Scalar effect measures for a 2x2 table, using ``math`` rather than NumPy.
+
+    Returns (p1, p0, rd, rd_ci, or, or_ci, rr, rr_ci, nnt, are); measures
+    that are undefined for the table are None.
+    """
+    # ── Risks ──────────────────────────────────────────────────────────────
+    p1 = af / (af + bf) if (af + bf) > 0 else 0.0   # risk in exposed
+    p0 = cf / (cf + df_) if (cf + df_) > 0 else 0.0  # risk in unexposed
+    rd = p1 - p0
+    rd_se = math.sqrt(p1*(1-p1)/(af+bf) + p0*(1-p0)/(cf+df_)) if (af+bf) > 0 and (cf+df_) > 0 else 0.0
+    rd_ci = (rd - Z_95*rd_se, rd + Z_95*rd_se)
+
+    # ── Odds Ratio (Woolf CI) ──────────────────────────────────────────────
+    if bf > 0 and cf > 0:
+        or_val = af * df_ / (bf * cf)
+        log_or_se = math.sqrt(1/af + 1/bf + 1/cf + 1/df_)
+        log_or = math.log(or_val)
+        or_ci = (math.exp(log_or - Z_95*log_or_se), math.exp(log_or + Z_95*log_or_se))
+    else:
+        or_val, or_ci = None, (None, None)
+
+    # ── Relative Risk (Katz log CI) ────────────────────────────────────────
+    if p0 > 0 and p1 > 0:
+        rr_val = p1 / p0
+        log_rr = math.log(rr_val)
+        log_rr_se = math.sqrt(bf/(af*(af+bf)) + df_/(cf*(cf+df_)))
+        rr_ci = (math.exp(log_rr - Z_95*log_rr_se), math.exp(log_rr + Z_95*log_rr_se))
+    else:
+        rr_val, rr_ci = None, (None, None)
+
+    # ── NNT / NNH ─────────────────────────────────────────────────────────
+    nnt_val = 1.0 / abs(rd) if abs(rd) > 1e-10 else None
+
+    # ── Attributable risk (exposed) ────────────────────────────────────────
+    are = (p1 - p0) / p1 if p1 > 0 else None
+
+    return p1, p0, rd, rd_ci, or_val, or_ci, rr_val, rr_ci, nnt_val, are
+
+
 def run_logistic_regression(
     outcome: list[int],
     predictors: dict[str, list],
@@ -100,31 +118,50 @@ def run_logistic_regression(
 ) -> dict:
     """Multivariable logistic regression via statsmodels."""
     import pandas as pd
-    import statsmodels.formula.api as smf
-
-    df = pd.DataFrame(predictors)
-    df["__outcome__"] = outcome
-
-    parts = []
-    for col in predictors:
-        ptype = (predictor_types or {}).get(col, "continuous")
-        parts.append(f"C({col})" if ptype == "categorical" else col)
-
-    formula = "__outcome__ ~ " + " + ".join(parts)
+    import statsmodels.api as sm
 
     try:
-        model = smf.logit(formula, data=df).fit(disp=False, maxiter=200)
+        # Build the design matrix directly, with the column order and names a
+        # patsy formula would give: intercept, categorical dummies (``C(col)``
+        # when declared, ``col`` when patsy would infer it from a non-numeric
+        # or boolean column), then numerics
+        types = predictor_types or {}
+        prefixes = {}
+        for col, values in predictors.items():
+            if types.get(col, "continuous") == "categorical":
+                prefixes[col] = f"C({col})"
+            else:
+                series = pd.Series(values)
+                if not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+                    prefixes[col] = col
+
+        y = np.asarray(outcome, dtype=float)
+        x_parts = [np.ones((len(y), 1))]
+        names = ["Intercept"]
+        missing = np.zeros(len(y), dtype=bool)
+        for col in sorted(predictors, key=lambda c: c not in prefixes):
+            values = predictors[col]
+            if col in prefixes:
+                cat = pd.Categorical(values)
+                missing |= cat.codes < 0
+                x_parts.append(pd.get_dummies(cat, drop_first=True, dtype=float).to_numpy())
+                names.extend(f"{prefixes[col]}[T.{level}]" for level in cat.categories[1:])
+            else:
+                x = np.asarray(values, dtype=float)
+                missing |= np.isnan(x)
+                x_parts.append(x.reshape(-1, 1))
+                names.append(col)
+
+        X = np.hstack(x_parts)[~missing]
+        model = sm.Logit(y[~missing], X).fit(disp=False, maxiter=200, method="newton")
 
         coefficients = []
-        conf = model.conf_int()
-        for name in model.params.index:
-            coef = float(model.params[name])
-            se = float(model.bse[name])
-            z = float(model.tvalues[name])
-            p = float(model.pvalues[name])
-            ci_lo = float(conf.loc[name, 0])
-            ci_hi = float(conf.loc[name, 1])
-            is_intercept = name.lower() == "intercept"
+        for name, coef, se, z, p, (ci_lo, ci_hi) in zip(
+            names, model.params, model.bse, model.tvalues, model.pvalues, model.conf_int(),
+        ):
+            coef, se, z, p = float(coef), float(se), float(z), float(p)
+            ci_lo, ci_hi = float(ci_lo), float(ci_hi)
+            is_intercept = name == "Intercept"
             coefficients.append({
                 "variable": name,
                 "coef": coef,
@@ -181,10 +218,10 @@ def run_incidence_rate(
         if irr is not None:
             log_irr = float(np.log(irr))
             se_log_irr = float(np.sqrt(1.0/events + 1.0/comparison_events))
-            irr_ci = (float(np.exp(log_irr - 1.96*se_log_irr)), float(np.exp(log_irr + 1.96*se_log_irr)))
+            irr_ci = (float(np.exp(log_irr - Z_95*se_log_irr)), float(np.exp(log_irr + Z_95*se_log_irr)))
             # Score test p-value
             z = float((events - person_time * ir2) / np.sqrt(person_time * ir2 * (1 + person_time/comparison_person_time)))
-            p = float(2 * (1 - stats.norm.cdf(abs(z))))
+            p = two_sided_p(z)
         else:
             irr_ci = (None, None)
             p = None
@@ -5,6 +5,9 @@ import numpy as np
 from scipy import stats
 from typing import Literal
 
+from ._common import two_sided_p
+from ._constants import Z_95
+
 
 EffectMeasure = Literal["OR", "RR", "MD", "SMD"]
 
@@ -22,36 +25,38 @@ def run_meta_analysis(
     - {"name", "effect", "lower_ci", "upper_ci"}  — effect with 95% CI
     - {"name", "events_1", "n_1", "events_2", "n_2"}  — 2x2 table (OR/RR)
     """
-    data = _prepare_data(studies, measure)
-    if len(data) < 2:
+    names, yi, sei = _prepare_data(studies, measure)
+    if len(names) < 2:
         raise ValueError("At least 2 studies are required for meta-analysis.")
 
-    yi = np.array([d["yi"] for d in data])
-    sei = np.array([d["sei"] for d in data])
-    wi_fe = 1.0 / sei ** 2
+    sei2 = sei * sei
+    wi_fe = np.reciprocal(sei2)
+    sum_w = float(wi_fe.sum())
 
     # ── Fixed-effects pooled estimate ──────────────────────────────────────
-    fe_est = float(np.sum(wi_fe * yi) / np.sum(wi_fe))
-    fe_se = float(np.sqrt(1.0 / np.sum(wi_fe)))
+    fe_est = float(wi_fe @ yi) / sum_w
+    fe_se = float(np.sqrt(1.0 / sum_w))
     fe_z = fe_est / fe_se
-    fe_p = float(2 * (1 - stats.norm.cdf(abs(fe_z))))
-    fe_ci = (fe_est - 1.96 * fe_se, fe_est + 1.96 * fe_se)
+    fe_p = two_sided_p(fe_z)
+    fe_ci = (fe_est - Z_95 * fe_se, fe_est + Z_95 * fe_se)
 
     # ── Heterogeneity (Cochran's Q, I², tau²) ──────────────────────────────
-    Q = float(np.sum(wi_fe * (yi - fe_est) ** 2))
+    resid = yi - fe_est
+    Q = float(wi_fe @ (resid * resid))
     df_q = len(yi) - 1
-    Q_p = float(1 - stats.chi2.cdf(Q, df=df_q))
+    Q_p = float(stats.chi2.sf(Q, df=df_q))
     I2 = float(max(0.0, (Q - df_q) / Q * 100)) if Q > df_q else 0.0
-    C = float(np.sum(wi_fe) - np.sum(wi_fe ** 2) / np.sum(wi_fe))
+    C = sum_w - float(wi_fe @ wi_fe) / sum_w
     tau2 = float(max(0.0, (Q - df_q) / C)) if C > 0 else 0.0
 
     # ── DerSimonian-Laird random-effects ────────────────────────────────────
-    wi_re = 1.0 / (sei ** 2 + tau2)
-    re_est = float(np.sum(wi_re * yi) / np.sum(wi_re))
-    re_se = float(np.sqrt(1.0 / np.sum(wi_re)))
+    wi_re = np.reciprocal(sei2 + tau2)
+    sum_w_re = float(wi_re.sum())
+    re_est = float(wi_re @ yi) / sum_w_re
+    re_se = float(np.sqrt(1.0 / sum_w_re))
     re_z = re_est / re_se
-    re_p = float(2 * (1 - stats.norm.cdf(abs(re_z))))
-    re_ci = (re_est - 1.96 * re_se, re_est + 1.96 * re_se)
+    re_p = two_sided_p(re_z)
+    re_ci = (re_est - Z_95 * re_se, re_est + Z_95 * re_se)
 
     # ── Select model weights ────────────────────────────────────────────────
     weights = wi_re if model == "random" else wi_fe
@@ -69,27 +74,35 @@ def run_meta_analysis(
         return [_display(lo), _display(hi)]
 
     # ── Forest-plot study data ──────────────────────────────────────────────
-    forest_studies = []
-    for i, d in enumerate(data):
-        ci_lo = d["yi"] - 1.96 * d["sei"]
-        ci_hi = d["yi"] + 1.96 * d["sei"]
-        forest_studies.append({
-            "name": d["name"],
-            "yi": float(d["yi"]),
-            "sei": float(d["sei"]),
-            "ci_lo": float(ci_lo),
-            "ci_hi": float(ci_hi),
-            "weight": float(weights_pct[i]),
-            "effect_display": _display(d["yi"]),
-            "ci_lo_display": _display(ci_lo),
-            "ci_hi_display": _display(ci_hi),
-        })
+    ci_lo = yi - Z_95 * sei
+    ci_hi = yi + Z_95 * sei
+    if on_log:
+        eff_disp, lo_disp, hi_disp = np.exp(yi), np.exp(ci_lo), np.exp(ci_hi)
+    else:
+        eff_disp, lo_disp, hi_disp = yi, ci_lo, ci_hi
+    forest_studies = [
+        {
+            "name": name,
+            "yi": y,
+            "sei": se,
+            "ci_lo": lo,
+            "ci_hi": hi,
+            "weight": w,
+            "effect_display": e_d,
+            "ci_lo_display": lo_d,
+            "ci_hi_display": hi_d,
+        }
+        for name, y, se, lo, hi, w, e_d, lo_d, hi_d in zip(
+            names, yi.tolist(), sei.tolist(), ci_lo.tolist(), ci_hi.tolist(), weights_pct,
+            eff_disp.tolist(), lo_disp.tolist(), hi_disp.tolist(),
+        )
+    ]
 
     return {
         "type": "meta",
         "measure": measure,
         "model": model,
-        "n_studies": len(data),
+        "n_studies": len(names),
         "heterogeneity": {
             "Q": Q,
             "df": df_q,
@@ -128,9 +141,9 @@ def run_meta_analysis(
         },
         "forest_studies": forest_studies,
         "funnel_data": {
-            "yi": [float(d["yi"]) for d in data],
-            "sei": [float(d["sei"]) for d in data],
-            "names": [d["name"] for d in data],
+            "yi": yi.tolist(),
+            "sei": sei.tolist(),
+            "names": names,
             "pooled_est": float(pooled["estimate"]),
         },
         "label": "log(OR)" if measure == "OR" else ("log(RR)" if measure == "RR" else measure),
@@ -139,47 +152,70 @@ def run_meta_analysis(
     }
 
 
-def _prepare_data(studies: list[dict], measure: str) -> list[dict]:
-    result = []
+def _prepare_data(studies: list[dict], measure: str) -> tuple[list[str], np.ndarray, np.ndarray]:
+    """Return study names plus contiguous yi/sei arrays, in input order."""
+    # Bucket studies by input schema, then convert each bucket in one shot
+    fields: dict[str, list[tuple]] = {"yi": [], "ci": [], "2x2": []}
+    positions: dict[str, list[int]] = {"yi": [], "ci": [], "2x2": []}
+    names: list[str] = []
     for s in studies:
-        name = str(s.get("name", f"Study {len(result)+1}"))
-
         if "yi" in s and "sei" in s:
-            result.append({"name": name, "yi": float(s["yi"]), "sei": float(s["sei"])})
-
+            key, row = "yi", (float(s["yi"]), float(s["sei"]))
         elif "effect" in s and "lower_ci" in s and "upper_ci" in s:
-            eff = float(s["effect"])
-            lo = float(s["lower_ci"])
-            hi = float(s["upper_ci"])
-            if measure in ("OR", "RR"):
-                yi = float(np.log(eff))
-                sei = float((np.log(hi) - np.log(lo)) / (2 * 1.96))
-            else:
-                yi = eff
-                sei = float((hi - lo) / (2 * 1.96))
-            result.append({"name": name, "yi": yi, "sei": sei})
-
+            key, row = "ci", (float(s["effect"]), float(s["lower_ci"]), float(s["upper_ci"]))
         elif "events_1" in s and "n_1" in s and "events_2" in s and "n_2" in s:
-            e1, n1 = int(s["events_1"]), int(s["n_1"])
-            e2, n2 = int(s["events_2"]), int(s["n_2"])
-            # Continuity correction
-            a = e1 + 0.5 if (e1 == 0 or e1 == n1 or e2 == 0 or e2 == n2) else e1
-            b_val = n1 - e1 + (0.5 if a != e1 else 0)
-            c = e2 + 0.5 if (e1 == 0 or e1 == n1 or e2 == 0 or e2 == n2) else e2
-            d = n2 - e2 + (0.5 if c != e2 else 0)
-            if measure == "OR":
-                yi = float(np.log(a * d / (b_val * c)))
-                sei = float(np.sqrt(1/a + 1/b_val + 1/c + 1/d))
-            elif measure == "RR":
-                p1 = a / (a + b_val)
-                p2 = c / (c + d)
-                yi = float(np.log(p1 / p2))
-                sei = float(np.sqrt((b_val / (a * (a + b_val))) + (d / (c * (c + d)))))
-            else:
-                raise ValueError(f"Unsupported measure '{measure}' for 2x2 table input")
-            result.append({"name": name, "yi": yi, "sei": sei})
-
-    return result
+            key, row = "2x2", (int(s["events_1"]), int(s["n_1"]), int(s["events_2"]), int(s["n_2"]))
+        else:
+            continue
+        positions[key].append(len(names))
+        names.append(str(s.get("name", f"Study {len(names)+1}")))
+        fields[key].append(row)
+
+    yi = np.empty(len(names))
+    sei = np.empty(len(names))
+    if fields["yi"]:
+        yi[positions["yi"]], sei[positions["yi"]] = np.array(fields["yi"], dtype=float).T
+    if fields["ci"]:
+        cols = np.array(fields["ci"], dtype=float).T
+        yi[positions["ci"]], sei[positions["ci"]] = _effects_from_ci(*cols, measure)
+    if fields["2x2"]:
+        cols = np.array(fields["2x2"], dtype=float).T
+        yi[positions["2x2"]], sei[positions["2x2"]] = _effects_from_2x2(*cols, measure)
+
+    return names, yi, sei
+
+
+def _effects_from_ci(
+    eff: np.ndarray,
+    lo: np.ndarray,
+    hi: np.ndarray,
+    measure: str,
+) -> tuple[np.ndarray, np.ndarray]:
+    if measure in ("OR", "RR"):
+        return np.log(eff), (np.log(hi) - np.log(lo)) / (2 * Z_95)
+    return eff, (hi - lo) / (2 * Z_95)
+
+
+def _effects_from_2x2(
+    e1: np.ndarray,
+    n1: np.ndarray,
+    e2: np.ndarray,
+    n2: np.ndarray,
+    measure: str,
+) -> tuple[np.ndarray, np.ndarray]:
+    # Continuity correction: add 0.5 to every cell of tables with a zero cell
+    cc = 0.5 * ((e1 == 0) | (e1 == n1) | (e2 == 0) | (e2 == n2))
+    a = e1 + cc
+    b = n1 - e1 + cc
+    c = e2 + cc
+    d = n2 - e2 + cc
+    if measure == "OR":
+        return np.log(a * d / (b * c)), np.sqrt(1/a + 1/b + 1/c + 1/d)
+    elif measure == "RR":
+        p1 = a / (a + b)
+        p2 = c / (c + d)
+        return np.log(p1 / p2), np.sqrt((b / (a * (a + b))) + (d / (c * (c + d))))
+    raise ValueError(f"Unsupported measure '{measure}' for 2x2 table input")
 
 
 def _interpret_i2(i2: float) -> str:
@@ -5,6 +5,13 @@ import numpy as np
 from scipy import stats
 from typing import Optional
 
+from ._constants import Z_95
+
+try:
+    import numba
+except ImportError:  # optional accelerator; the NumPy paths are used otherwise
+    numba = None
+
 
 def run_kaplan_meier(
     time: list[float],
@@ -12,30 +19,40 @@ def run_kaplan_meier(
     groups: Optional[list] = None,
 ) -> dict:
     """Kaplan-Meier survival analysis with optional group comparison."""
-    t = np.array(time, dtype=float)
-    e = np.array(event, dtype=int)
-
-    if groups is not None:
-        g = np.array(groups)
-        unique_groups = sorted(set(g.tolist()))
+    # Sort once by time; every helper below works on these time-sorted arrays.
+    # Events are stored as a compact 0/1 int8 array.
+    t = np.ascontiguousarray(time, dtype=np.float64)
+    order = np.argsort(t, kind="stable")
+    t = t[order]
+    e = (np.asarray(event)[order] == 1).view(np.int8)
+
+    if groups is not None and len(groups):
+        g = np.asarray(groups)[order]
+        # Partition once into contiguous per-group spans of a group-sorted copy
+        codes, inv = np.unique(g, return_inverse=True)
+        by_group = np.argsort(inv, kind="stable")
+        bounds = np.searchsorted(inv[by_group], np.arange(codes.size + 1))
+        t_grouped, e_grouped = t[by_group], e[by_group]
+        unique_groups = codes.tolist()
     else:
         g = None
         unique_groups = [None]
 
-    curves = []
-    for grp in unique_groups:
-        if grp is not None:
-            mask = g == grp
-            ti, ei = t[mask], e[mask]
-        else:
-            ti, ei = t, e
+    if g is not None:
+        spans = [(t_grouped[lo:hi], e_grouped[lo:hi]) for lo, hi in zip(bounds[:-1], bounds[1:])]
+    else:
+        spans = [(t, e)]
+
+    kms = [_km_estimate(ti, ei) for ti, ei in spans]
 
-        km = _km_estimate(ti, ei)
-        curves.append({
+    curves = [
+        {
             "label": str(grp) if grp is not None else "Overall",
             "n": int(len(ti)),
             **km,
-        })
+        }
+        for grp, (ti, _), km in zip(unique_groups, spans, kms)
+    ]
 
     logrank = None
     if len(unique_groups) == 2 and unique_groups[0] is not None:
@@ -44,56 +61,53 @@ def run_kaplan_meier(
     return {"type": "survival", "curves": curves, "logrank": logrank}
 
 
-def _km_estimate(time: np.ndarray, event: np.ndarray) -> dict:
-    order = np.argsort(time)
-    t = time[order]
-    e = event[order]
-
-    unique_event_times = np.unique(t[e == 1])
-
-    step_times = [0.0]
-    step_surv = [1.0]
-    step_lo = [1.0]
-    step_hi = [1.0]
-    n_at_risk_list: list[int] = []
-    n_events_list: list[int] = []
-
-    s = 1.0
-    greenwood_sum = 0.0
-
-    for et in unique_event_times:
-        n_risk = int(np.sum(t >= et))
-        d = int(np.sum((t == et) & (e == 1)))
-
-        if n_risk == 0:
-            continue
-
-        s *= (n_risk - d) / n_risk
-
-        if n_risk > d:
-            greenwood_sum += d / (n_risk * (n_risk - d))
+def _km_estimate(t: np.ndarray, e: np.ndarray) -> dict:
+    """KM curve from time-sorted times and 0/1 int8 events."""
 
-        # 95% CI via Kalbfleisch-Prentice (log-log) transformation
-        if 0 < s < 1 and greenwood_sum > 0:
-            c = np.exp(1.96 * np.sqrt(greenwood_sum) / abs(np.log(s)))
-            lo = float(s ** c)
-            hi = float(s ** (1.0 / c))
-        else:
-            lo = hi = float(s)
-
-        step_times.append(float(et))
-        step_surv.append(float(np.clip(s, 0.0, 1.0)))
-        step_lo.append(float(np.clip(lo, 0.0, 1.0)))
-        step_hi.append(float(np.clip(hi, 0.0, 1.0)))
-        n_at_risk_list.append(n_risk)
-        n_events_list.append(d)
-
-    # Median survival: first time survival ≤ 0.5
-    median = None
-    for i, sv in enumerate(step_surv):
-        if sv <= 0.5:
-            median = step_times[i]
-            break
+    if _km_counts_jit is not None:
+        event_times, d, n_risk = _km_counts_jit(t, e)
+    else:
+        # Risk-set sizes and event counts at every distinct time in one pass:
+        # everything from a time's first sorted position onwards is still at risk
+        unique_t, first_idx = np.unique(t, return_index=True)
+        d_all = np.add.reduceat(e, first_idx, dtype=np.int64) if first_idx.size else np.zeros(0, dtype=np.int64)
+        n_all = t.size - first_idx
+
+        has_event = d_all > 0
+        event_times = unique_t[has_event]
+        d = d_all[has_event]
+        n_risk = n_all[has_event]
+
+    # Survival and Greenwood sums share the surviving counts; the Greenwood
+    # term is only evaluated where someone survives the event time
+    survivors = n_risk - d
+    surv = np.cumprod(survivors / n_risk)
+    gw_terms = np.divide(d, n_risk * survivors, out=np.zeros(d.size), where=survivors > 0)
+    greenwood = np.cumsum(gw_terms)
+
+    # 95% CI via Kalbfleisch-Prentice (log-log) transformation
+    valid = (surv > 0) & (surv < 1) & (greenwood > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        c = np.exp(Z_95 * np.sqrt(greenwood) / np.abs(np.log(surv)))
+        lo = np.where(valid, surv ** c, surv)
+        hi = np.where(valid, surv ** (1.0 / c), surv)
+
+    # Step functions (times, survival, lower, upper) filled into one
+    # preallocated block and converted to lists once at the boundary
+    steps = np.empty((4, event_times.size + 1))
+    steps[:, 0] = (0.0, 1.0, 1.0, 1.0)
+    steps[0, 1:] = event_times
+    np.clip(surv, 0.0, 1.0, out=steps[1, 1:])
+    np.clip(lo, 0.0, 1.0, out=steps[2, 1:])
+    np.clip(hi, 0.0, 1.0, out=steps[3, 1:])
+    step_times, step_surv, step_lo, step_hi = steps.tolist()
+    n_at_risk_list: list[int] = n_risk.tolist()
+    n_events_list: list[int] = d.tolist()
+
+    # Median survival: first time survival ≤ 0.5 (survival is non-increasing,
+    # so its negation is sorted and can be binary-searched)
+    idx = int(np.searchsorted(-surv, -0.5))
+    median = float(event_times[idx]) if idx < surv.size else None
 
     return {
         "times": step_times,
@@ -103,44 +117,31 @@ def _km_estimate(time: np.ndarray, event: np.ndarray) -> dict:
         "n_at_risk": n_at_risk_list,
         "n_events": n_events_list,
         "median_survival": median,
-        "n_total_events": int(np.sum(event == 1)),
+        "n_total_events": int(e.sum()),
     }
 
 
 def _logrank_test(
-    time: np.ndarray,
-    event: np.ndarray,
-    group: np.ndarray,
+    t: np.ndarray,
+    e: np.ndarray,
+    g: np.ndarray,
     groups: list,
 ) -> dict:
-    mask1 = group == groups[0]
-    mask2 = group == groups[1]
-    event_times = np.unique(time[event == 1])
-
-    O1, E1, V = 0.0, 0.0, 0.0
-
-    for et in event_times:
-        n1 = int(np.sum(time[mask1] >= et))
-        n2 = int(np.sum(time[mask2] >= et))
-        d1 = int(np.sum((time[mask1] == et) & (event[mask1] == 1)))
-        d2 = int(np.sum((time[mask2] == et) & (event[mask2] == 1)))
-        n = n1 + n2
-        d = d1 + d2
-
-        if n == 0:
-            continue
-
-        O1 += d1
-        E1 += n1 * d / n
+    """Log-rank test on time-sorted times, 0/1 int8 events and group labels."""
+    ev = e.view(np.bool_)
+    is1 = g == groups[0]
+    is2 = g == groups[1]
 
-        if n > 1:
-            V += n1 * n2 * d * (n - d) / (n ** 2 * (n - 1))
+    if _logrank_sums_jit is not None:
+        O1, E1, V = _logrank_sums_jit(t, ev, is1, is2)
+    else:
+        O1, E1, V = _logrank_sums(t, ev, is1, is2)
 
     if V < 1e-10:
         return {"chi2": 0.0, "p_value": 1.0, "group1": str(groups[0]), "group2": str(groups[1])}
 
     chi2 = (O1 - E1) ** 2 / V
-    p = float(1 - stats.chi2.cdf(chi2, df=1))
+    p = float(stats.chi2.sf(chi2, df=1))
 
     return {
         "chi2": float(chi2),
@@ -152,6 +153,36 @@ def _logrank_test(
     }
 
 
+def _logrank_sums(
+    t: np.ndarray,
+    ev: np.ndarray,
+    is1: np.ndarray,
+    is2: np.ndarray,
+) -> tuple[float, float, float]:
+    # Per distinct time: events per group counted by bucket id, and risk sets
+    # as the group counts from that time's first sorted position onwards
+    unique_t, first_idx, bucket = np.unique(t, return_index=True, return_inverse=True)
+    d1 = np.bincount(bucket[ev & is1], minlength=unique_t.size)
+    d2 = np.bincount(bucket[ev & is2], minlength=unique_t.size)
+    cum1 = np.concatenate(([0], np.cumsum(is1)))
+    cum2 = np.concatenate(([0], np.cumsum(is2)))
+    n1 = (cum1[-1] - cum1[first_idx]).astype(float)
+    n2 = (cum2[-1] - cum2[first_idx]).astype(float)
+
+    keep = (d1 + d2) > 0
+    d1, d2, n1, n2 = d1[keep], d2[keep], n1[keep], n2[keep]
+    n = n1 + n2
+    d = d1 + d2
+
+    O1 = float(d1.sum())
+    E1 = float(np.sum(n1 * d / n))
+    multi = n > 1
+    V = float(np.sum(n1[multi] * n2[multi] * d[multi] * (n[multi] - d[multi])
+                     / (n[multi] ** 2 * (n[multi] - 1))))
+
+    return O1, E1, V
+
+
 def _interpret_p(p: float) -> str:
     if p < 0.001:
         return "p < 0.001 (highly significant)"
@@ -159,3 +190,74 @@ def _interpret_p(p: float) -> str:
         return f"p = {p:.4f} (significant)"
     else:
         return f"p = {p:.4f} (not significant)"
+
+
+# ── Optional Numba kernels ────────────────────────────────────────────────────
+# Single forward scans over time-sorted arrays, equivalent to the NumPy paths
+# above but without their temporaries. Only compiled when numba is installed;
+# nogil lets them run concurrently from threads.
+
+def _km_counts_loop(t, e):
+    n = t.size
+    times = np.empty(n, dtype=np.float64)
+    d = np.empty(n, dtype=np.int64)
+    n_risk = np.empty(n, dtype=np.int64)
+    m = 0
+    i = 0
+    while i < n:
+        ti = t[i]
+        j = i
+        dj = 0
+        while j < n and t[j] == ti:
+            if e[j]:
+                dj += 1
+            j += 1
+        if dj > 0:
+            times[m] = ti
+            d[m] = dj
+            n_risk[m] = n - i
+            m += 1
+        i = j
+    return times[:m], d[:m], n_risk[:m]
+
+
+def _logrank_sums_loop(t, ev, is1, is2):
+    n = t.size
+    n1 = float(is1.sum())
+    n2 = float(is2.sum())
+    O1 = 0.0
+    E1 = 0.0
+    V = 0.0
+    i = 0
+    while i < n:
+        ti = t[i]
+        j = i
+        d1 = 0.0
+        d2 = 0.0
+        c1 = 0.0
+        c2 = 0.0
+        while j < n and t[j] == ti:
+            if ev[j]:
+                d1 += is1[j]
+                d2 += is2[j]
+            c1 += is1[j]
+            c2 += is2[j]
+            j += 1
+        d = d1 + d2
+        if d > 0:
+            nt = n1 + n2
+            O1 += d1
+            E1 += n1 * d / nt
+            if nt > 1:
+                V += n1 * n2 * d * (nt - d) / (nt * nt * (nt - 1))
+        n1 -= c1
+        n2 -= c2
+        i = j
+    return O1, E1, V
+
+
+if numba is not None:
+    _km_counts_jit = numba.njit(cache=True, nogil=True)(_km_counts_loop)
+    _logrank_sums_jit = numba.njit(cache=True, nogil=True)(_logrank_sums_loop)
+else:
+    _km_counts_jit = _logrank_sums_jit = None
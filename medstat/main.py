@@ -4,8 +4,10 @@ from __future__ import annotations
 from pathlib import Path
 
 import uvicorn
-from fastapi import FastAPI
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from .routers import biomarker, clinical, data, epidemiology, meta, survival
@@ -16,6 +18,7 @@ app = FastAPI(
     description="Statistical analysis tool for medical research",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
+    default_response_class=ORJSONResponse,
 )
 
 app.include_router(survival.router, prefix="/api/survival", tags=["Survival Analysis"])
@@ -25,6 +28,16 @@ app.include_router(epidemiology.router, prefix="/api/epi", tags=["Epidemiology"]
 app.include_router(biomarker.router, prefix="/api/biomarker", tags=["Biomarker Analysis"])
 app.include_router(data.router, prefix="/api/data", tags=["Data"])
 
+
+@app.exception_handler(RequestValidationError)
+async def validation_error(request: Request, exc: RequestValidationError) -> ORJSONResponse:
+    # Same 422 body as FastAPI's default, minus the echoed ``input``: model-level
+    # errors would otherwise send the whole (possibly large, patient-level)
+    # payload back to the client
+    errors = [{k: v for k, v in err.items() if k != "input"} for err in exc.errors()]
+    return ORJSONResponse(status_code=422, content={"detail": jsonable_encoder(errors)})
+
+
 _STATIC = Path(__file__).parent / "static"
 app.mount("/static", StaticFiles(directory=str(_STATIC)), name="static")
 
@@ -3,8 +3,9 @@ from __future__ import annotations
 
 from typing import Literal, Optional
 
+import numpy as np
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr, model_validator
 
 from ..analysis.biomarker import run_roc_analysis
 
@@ -18,21 +19,34 @@ class ROCRequest(BaseModel):
     threshold: Optional[float] = None
     positive_direction: Literal["high", "low"] = "high"
 
+    # Arrays built during validation, reused by the handler
+    _marker: np.ndarray = PrivateAttr()
+    _outcome: np.ndarray = PrivateAttr()
+
+    @model_validator(mode="after")
+    def _check(self) -> ROCRequest:
+        if len(self.marker) != len(self.outcome):
+            raise ValueError("marker and outcome must have the same length.")
+        if len(self.marker) < 5:
+            raise ValueError("At least 5 observations are required.")
+        marker = np.asarray(self.marker, dtype=float)
+        if not np.isfinite(marker).all():
+            raise ValueError("marker must not contain NaN or infinite values.")
+        outcome = np.asarray(self.outcome, dtype=int)
+        if ((outcome != 0) & (outcome != 1)).any():
+            raise ValueError("outcome must be binary (0/1).")
+        n_pos = int(outcome.sum())
+        if n_pos == 0 or n_pos == outcome.size:
+            raise ValueError("outcome must have both positive and negative cases.")
+        self._marker, self._outcome = marker, outcome
+        return self
+
 
 @router.post("/roc")
 async def roc(req: ROCRequest) -> dict:
-    if len(req.marker) != len(req.outcome):
-        raise HTTPException(400, "marker and outcome must have the same length.")
-    if len(req.marker) < 5:
-        raise HTTPException(400, "At least 5 observations are required.")
-    if any(v not in (0, 1) for v in req.outcome):
-        raise HTTPException(400, "outcome must be binary (0/1).")
-    n_pos = sum(req.outcome)
-    if n_pos == 0 or n_pos == len(req.outcome):
-        raise HTTPException(400, "outcome must have both positive and negative cases.")
     try:
         return run_roc_analysis(
-            req.marker, req.outcome,
+            req._marker, req._outcome,
             req.marker_name, req.threshold, req.positive_direction,
         )
     except Exception as exc:
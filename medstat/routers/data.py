@@ -1,7 +1,9 @@
 """Data ingestion: CSV/Excel upload and REDCap connector."""
 from __future__ import annotations
 
-import io
+import importlib.util
+import uuid
+from collections import OrderedDict
 
 import pandas as pd
 from fastapi import APIRouter, File, Form, HTTPException, UploadFile
@@ -9,8 +11,52 @@ from pydantic import BaseModel
 
 router = APIRouter()
 
-
-def _describe_df(df: pd.DataFrame) -> dict:
+# Datasets uploaded with include_data=false, kept in this process's memory so
+# clients can page through rows. Bounded by count and by total in-memory size;
+# the least recently used entry is evicted first.
+_MAX_DATASETS = 16
+_MAX_DATASET_BYTES = 256 * 1024 * 1024
+_MAX_PAGE_ROWS = 5000
+_datasets: OrderedDict[str, tuple[pd.DataFrame, int]] = OrderedDict()
+_datasets_bytes = 0
+
+# Faster parsers when installed (optional; pandas' defaults otherwise)
+_CSV_ENGINE = "pyarrow" if importlib.util.find_spec("pyarrow") else "c"
+_EXCEL_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else None
+
+# Leading bytes of .xlsx (zip) and legacy .xls (OLE2) workbooks
+_EXCEL_MAGIC = (b"PK\x03\x04", b"\xd0\xcf\x11\xe0")
+
+
+def _store_dataset(df: pd.DataFrame) -> str:
+    global _datasets_bytes
+    nbytes = int(df.memory_usage(deep=True).sum())
+    if nbytes > _MAX_DATASET_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail="Dataset is too large to keep server-side; upload it with include_data=true.",
+        )
+
+    dataset_id = uuid.uuid4().hex
+    _datasets[dataset_id] = (df, nbytes)
+    _datasets_bytes += nbytes
+    while len(_datasets) > _MAX_DATASETS or _datasets_bytes > _MAX_DATASET_BYTES:
+        _, (_, evicted) = _datasets.popitem(last=False)
+        _datasets_bytes -= evicted
+    return dataset_id
+
+
+def _records(df: pd.DataFrame) -> list[dict]:
+    # fillna("") leaves NaT in datetime columns, so blank those separately
+    dt_cols = df.select_dtypes(include=["datetime", "datetimetz"]).columns
+    if len(dt_cols):
+        df = df.copy()
+        for col in dt_cols:
+            df[col] = df[col].astype(str).where(df[col].notna(), "")
+    return df.fillna("").astype(str).to_dict(orient="records")
+
+
+def _describe_df(df: pd.DataFrame, include_data: bool = True) -> dict:
     columns = []
     for col in df.columns:
         series = df[col]
@@ -18,11 +64,17 @@ def _describe_df(df: pd.DataFrame) -> dict:
         n_unique = int(series.nunique(dropna=True))
         sample = series.dropna().head(5).tolist()
 
-        # Auto-detect column type
-        try:
-            pd.to_numeric(series.dropna())
+        # Auto-detect column type: numeric dtypes need no parsing, otherwise
+        # the column is numeric if coercion loses no non-missing values.
+        # Timestamps (which the pyarrow CSV engine parses eagerly) coerce to
+        # integers but are labels, not measurements.
+        if pd.api.types.is_datetime64_any_dtype(series):
+            col_type = "categorical" if n_unique <= 30 else "text"
+        elif pd.api.types.is_numeric_dtype(series):
             col_type = "numeric"
-        except (ValueError, TypeError):
+        elif pd.to_numeric(series, errors="coerce").notna().sum() == len(series) - n_missing:
+            col_type = "numeric"
+        else:
             col_type = "categorical" if n_unique <= 30 else "text"
 
         columns.append({
@@ -34,38 +86,62 @@ def _describe_df(df: pd.DataFrame) -> dict:
             "sample_values": [str(v) for v in sample],
         })
 
-    return {
+    result = {
         "n_rows": len(df),
         "n_cols": len(df.columns),
         "columns": columns,
-        "preview": df.head(8).fillna("").astype(str).to_dict(orient="records"),
-        "data": df.fillna("").astype(str).to_dict(orient="records"),
     }
+    # Serialize the frame at most once; the preview is a slice of the same rows.
+    # Without inline data the frame is kept server-side for paging instead.
+    if include_data:
+        data = _records(df)
+        result["preview"] = data[:8]
+        result["data"] = data
+    else:
+        result["dataset_id"] = _store_dataset(df)
+        result["preview"] = _records(df.head(8))
+    return result
 
 
 @router.post("/upload")
-async def upload_file(file: UploadFile = File(...), sheet: str = Form(None)) -> dict:
+async def upload_file(
+    file: UploadFile = File(...),
+    sheet: str = Form(None),
+    include_data: bool = Form(True),
+) -> dict:
     """Upload a CSV or Excel file; returns column metadata and full data.
 
     For Excel files the response includes a ``sheets`` list. Pass ``sheet``
     to select a specific sheet; defaults to the first sheet.
+
+    Pass ``include_data=false`` to omit the full ``data`` rows and page
+    through them via ``GET /{dataset_id}/rows`` instead. The frame is held in
+    the memory of the worker process that handled the upload, so a
+    ``dataset_id`` is only valid on that process and may be evicted once
+    newer uploads exceed the store's count or size limits.
     """
-    content = await file.read()
+    # Parse straight from the spooled upload file rather than copying its
+    # bytes into memory; only the leading signature is read up front
+    stream = file.file
+    head = stream.read(len(_EXCEL_MAGIC[0]))
+    stream.seek(0)
     name = file.filename or ""
 
     try:
-        if name.endswith(".csv"):
-            df = pd.read_csv(io.BytesIO(content))
-            return _describe_df(df)
-        elif name.endswith((".xlsx", ".xls")):
-            xf = pd.ExcelFile(io.BytesIO(content))
+        # Workbooks are recognised by content as well as extension, so a
+        # mislabelled file goes straight to the Excel reader
+        if head.startswith(_EXCEL_MAGIC) or name.endswith((".xlsx", ".xls")):
+            xf = pd.ExcelFile(stream, engine=_EXCEL_ENGINE)
             sheets = xf.sheet_names
             selected = sheet if (sheet and sheet in sheets) else sheets[0]
             df = xf.parse(selected)
-            result = _describe_df(df)
+            result = _describe_df(df, include_data)
             result["sheets"] = sheets
             result["active_sheet"] = selected
             return result
+        elif name.endswith(".csv"):
+            df = pd.read_csv(stream, engine=_CSV_ENGINE)
+            return _describe_df(df, include_data)
         else:
             raise HTTPException(status_code=400, detail="Unsupported file type. Use CSV or Excel (.xlsx/.xls).")
     except HTTPException:
@@ -74,6 +150,27 @@ async def upload_file(file: UploadFile = File(...), sheet: str = Form(None)) ->
         raise HTTPException(status_code=400, detail=f"Failed to parse file: {exc}") from exc
 
 
+@router.get("/{dataset_id}/rows")
+async def dataset_rows(dataset_id: str, offset: int = 0, limit: int = 500) -> dict:
+    """Return a page of rows from a previously uploaded dataset."""
+    entry = _datasets.get(dataset_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired dataset_id.")
+    df, _ = entry
+    _datasets.move_to_end(dataset_id)
+    if offset < 0 or limit < 1:
+        raise HTTPException(status_code=400, detail="offset must be ≥ 0 and limit must be ≥ 1.")
+    limit = min(limit, _MAX_PAGE_ROWS)
+
+    return {
+        "dataset_id": dataset_id,
+        "n_rows": len(df),
+        "offset": offset,
+        "limit": limit,
+        "rows": _records(df.iloc[offset:offset + limit]),
+    }
+
+
 class REDCapRequest(BaseModel):
     url: str
     token: str
@@ -108,8 +205,7 @@ async def fetch_redcap(body: REDCapRequest) -> dict:
         raise HTTPException(status_code=400, detail="No records returned from REDCap.")
 
     df = pd.DataFrame(records)
-    # Attempt numeric coercion column-by-column
-    for col in df.columns:
-        df[col] = pd.to_numeric(df[col], errors="ignore")
+    # Attempt numeric coercion of every column in one pass
+    df = df.apply(pd.to_numeric, errors="ignore")
 
     return _describe_df(df)
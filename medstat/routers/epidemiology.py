@@ -4,7 +4,7 @@ from __future__ import annotations
 from typing import Optional
 
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 
 from ..analysis.epidemiology import run_incidence_rate, run_logistic_regression, run_two_by_two
 
@@ -19,6 +19,15 @@ class TwoByTwoRequest(BaseModel):
     exposure_name: str = "Exposure"
     outcome_name: str = "Outcome"
 
+    @model_validator(mode="after")
+    def _check(self) -> TwoByTwoRequest:
+        cells = (self.a, self.b, self.c, self.d)
+        if min(cells) < 0:
+            raise ValueError("All cell counts must be non-negative.")
+        if sum(cells) == 0:
+            raise ValueError("Table cannot be all zeros.")
+        return self
+
 
 class LogisticRequest(BaseModel):
     outcome: list[int]
@@ -36,10 +45,6 @@ class IncidenceRequest(BaseModel):
 
 @router.post("/two_by_two")
 async def two_by_two(req: TwoByTwoRequest) -> dict:
-    if any(v < 0 for v in (req.a, req.b, req.c, req.d)):
-        raise HTTPException(400, "All cell counts must be non-negative.")
-    if req.a + req.b + req.c + req.d == 0:
-        raise HTTPException(400, "Table cannot be all zeros.")
     try:
         return run_two_by_two(req.a, req.b, req.c, req.d, req.exposure_name, req.outcome_name)
     except Exception as exc:
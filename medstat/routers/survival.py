@@ -1,34 +1,70 @@
 """Survival analysis API router."""
 from __future__ import annotations
 
+import hashlib
+from collections import OrderedDict
 from typing import Optional
 
+import numpy as np
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr, model_validator
 
 from ..analysis.survival import run_kaplan_meier
 
 router = APIRouter()
 
+# Results of recent analyses keyed by a digest of the request payload, so
+# resubmitting identical data (common while exploring in the UI) is free
+_MAX_CACHED = 64
+_results: OrderedDict[bytes, dict] = OrderedDict()
+
 
 class SurvivalRequest(BaseModel):
     time: list[float]
     event: list[int]
     groups: Optional[list] = None
 
+    # Arrays built during validation, reused by the handler
+    _time: np.ndarray = PrivateAttr()
+    _event: np.ndarray = PrivateAttr()
+
+    @model_validator(mode="after")
+    def _check(self) -> SurvivalRequest:
+        if len(self.time) != len(self.event):
+            raise ValueError("time and event must have the same length.")
+        if self.groups and len(self.groups) != len(self.time):
+            raise ValueError("groups must have the same length as time.")
+        time = np.asarray(self.time, dtype=float)
+        if (time < 0).any():
+            raise ValueError("All time values must be non-negative.")
+        event = np.asarray(self.event, dtype=int)
+        if ((event != 0) & (event != 1)).any():
+            raise ValueError("event must be binary (0 = censored, 1 = event).")
+        self._time, self._event = time, event
+        return self
+
 
 @router.post("/analyze")
 async def analyze(req: SurvivalRequest) -> dict:
-    if len(req.time) != len(req.event):
-        raise HTTPException(400, "time and event must have the same length.")
-    if req.groups and len(req.groups) != len(req.time):
-        raise HTTPException(400, "groups must have the same length as time.")
-    if any(v < 0 for v in req.time):
-        raise HTTPException(400, "All time values must be non-negative.")
-    if any(v not in (0, 1) for v in req.event):
-        raise HTTPException(400, "event must be binary (0 = censored, 1 = event).")
-
     try:
-        return run_kaplan_meier(req.time, req.event, req.groups)
+        return _cached_kaplan_meier(req._time, req._event, req.groups)
     except Exception as exc:
         raise HTTPException(500, str(exc)) from exc
+
+
+def _cached_kaplan_meier(time: np.ndarray, event: np.ndarray, groups: Optional[list]) -> dict:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(time.tobytes())
+    h.update(event.tobytes())
+    h.update(repr(groups).encode())
+    key = h.digest()
+
+    result = _results.get(key)
+    if result is None:
+        result = run_kaplan_meier(time, event, groups)
+        _results[key] = result
+        while len(_results) > _MAX_CACHED:
+            _results.popitem(last=False)
+    else:
+        _results.move_to_end(key)
+    return result
@@ -32,10 +32,16 @@ function setRunning(btn, running) {
   }
 }
 
+function errorDetail(data) {
+  // Request validation errors (422) carry a list of {msg, ...} objects
+  if (Array.isArray(data.detail)) return data.detail.map(e => e.msg.replace(/^Value error, /, '')).join('; ');
+  return data.detail;
+}
+
 async function postJSON(url, body) {
   const resp = await fetch(url, {method:'POST', headers:{'Content-Type':'application/json'}, body: JSON.stringify(body)});
   const data = await resp.json();
-  if (!resp.ok) throw new Error(data.detail || resp.statusText);
+  if (!resp.ok) throw new Error(errorDetail(data) || resp.statusText);
   return data;
 }
 
@@ -45,7 +51,7 @@ async function uploadFile(url, file, sheet) {
   if (sheet) fd.append('sheet', sheet);
   const resp = await fetch(url, {method:'POST', body: fd});
   const data = await resp.json();
-  if (!resp.ok) throw new Error(data.detail || resp.statusText);
+  if (!resp.ok) throw new Error(errorDetail(data) || resp.statusText);
   return data;
 }
 